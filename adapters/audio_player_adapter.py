@@ -1,12 +1,18 @@
 """Audio player adapter for playing audio files through specified devices."""
+import io
 import logging
+import threading
 from pathlib import Path
-from typing import Final, Optional
-
-import sounddevice as sd
-import soundfile as sf
+from typing import BinaryIO, Final, Optional, Union
 
 from core.config import config
+from utils.device_cache import device_cache
+
+PLAYBACK_BLOCKSIZE: Final[int] = 4096
+# Subtypes that fit in int16 are streamed without a float32 conversion.
+INT16_SUBTYPES: Final[frozenset] = frozenset({"PCM_16", "PCM_S8", "PCM_U8"})
+
+logger = logging.getLogger(__name__)
 
 
 class AudioPlayerAdapter:
@@ -14,38 +20,44 @@ class AudioPlayerAdapter:
 
     def __init__(self) -> None:
         """Initialize the audio player adapter."""
-        self._logger = logging.getLogger(self.__class__.__name__)
         self._device_name: Final[Optional[str]] = config.virtual_output_name
 
-    def play_audio(self, file_path: Path) -> None:
+    def play_audio(
+        self,
+        file_path: Path,
+        stop_event: Optional[threading.Event] = None,
+    ) -> None:
         """Play audio file through the configured output device.
 
         Args:
             file_path: Path to the audio file to play.
+            stop_event: Event that stops playback early once set, e.g. when
+                playing from a worker thread that Ctrl+C cannot reach.
         """
-        if not self.__validate_file(file_path):
-            return
-
         device_index = self.__find_output_device_index()
         if device_index is None:
-            self._logger.error("Audio output device was not found.")
+            logger.error("Audio output device was not found.")
             return
 
-        self.__play(file_path, device_index)
+        self.__play(file_path, device_index, stop_event)
 
-    def __validate_file(self, file_path: Path) -> bool:
-        """Validate that the audio file exists.
+    def play_audio_bytes(
+        self,
+        audio: bytes,
+        stop_event: Optional[threading.Event] = None,
+    ) -> None:
+        """Play encoded audio held in memory through the output device.
 
         Args:
-            file_path: Path to the audio file to validate.
-
-        Returns:
-            True if file exists, False otherwise.
+            audio: Contents of an audio file in any format libsndfile reads.
+            stop_event: Event that stops playback early once set.
         """
-        if not file_path.exists():
-            self._logger.error(f"Audio file does not exist: {file_path}")
-            return False
-        return True
+        device_index = self.__find_output_device_index()
+        if device_index is None:
+            logger.error("Audio output device was not found.")
+            return
+
+        self.__play(io.BytesIO(audio), device_index, stop_event)
 
     def __find_output_device_index(self) -> Optional[int]:
         """Find the index of the configured output device.
@@ -54,39 +66,64 @@ class AudioPlayerAdapter:
             Device index if found, None otherwise.
         """
         if self._device_name is None:
-            self._logger.error("Audio output device name is not set in config.")
+            logger.error("Audio output device name is not set in config.")
             return None
-        for idx, device in enumerate(sd.query_devices()):
-            if self._device_name.lower() in device["name"].lower(
-            ) and device["max_output_channels"] > 0:
-                return idx
-        self._logger.error(
-            f"Audio output device '{self._device_name}' not found.",)
+        idx = device_cache.find_index(self._device_name, is_input=False)
+        if idx is not None:
+            return idx
+        logger.error("Audio output device '%s' not found.", self._device_name)
         return None
 
-    def __play(self, file_path: Path, device_index: int) -> None:
+    def __play(
+        self,
+        source: Union[Path, BinaryIO],
+        device_index: int,
+        stop_event: Optional[threading.Event],
+    ) -> None:
         """Play the audio file through the specified device.
 
         Args:
-            file_path: Path to the audio file to play.
+            source: Path to the audio file, or a binary file object with
+                its contents.
             device_index: Index of the audio device to use.
+            stop_event: Event checked between blocks to stop playback early.
         """
+        # pylint: disable=import-outside-toplevel
+        import sounddevice as sd
+        import soundfile as sf
+
         try:
-            data, samplerate = sf.read(str(file_path), dtype="float32")
-            sd.play(data, samplerate=samplerate, device=device_index)
+            sound_file = sf.SoundFile(
+                str(source) if isinstance(source, Path) else source)
+        except (FileNotFoundError, sf.LibsndfileError) as exception:
+            label = source if isinstance(source, Path) else "in-memory audio"
+            logger.error("Audio file could not be opened: %s (%s)", label,
+                         exception)
+            return
 
-            while sd.get_stream().active:
-                try:
-                    sd.sleep(100)
-                except KeyboardInterrupt:
-                    self._logger.info("Audio playback interrupted by user")
-                    sd.stop()
-                    raise
+        dtype = ("int16" if sound_file.subtype in INT16_SUBTYPES else "float32")
+        try:
+            with sound_file:
+                with sd.OutputStream(
+                        samplerate=sound_file.samplerate,
+                        channels=sound_file.channels,
+                        dtype=dtype,
+                        device=device_index,
+                        extra_settings=device_cache.extra_settings(
+                            device_index),
+                ) as stream:
+                    for block in sound_file.blocks(
+                            blocksize=PLAYBACK_BLOCKSIZE,
+                            dtype=dtype,
+                    ):
+                        if stop_event is not None and stop_event.is_set():
+                            logger.info("Audio playback stopped.")
+                            break
+                        stream.write(block)
 
         except KeyboardInterrupt:
-            self._logger.info("Audio playback interrupted")
-            sd.stop()
+            logger.info("Audio playback interrupted by user")
             raise
         except Exception as exception:  # pylint: disable=broad-exception-caught
-            self._logger.exception(
-                f"Error occurred while playing audio: {exception}",)
+            logger.exception("Error occurred while playing audio: %s",
+                             exception)
@@ -1,17 +1,40 @@
 """Bridge for forwarding microphone audio to virtual cable."""
+import collections
 import logging
-import queue
-from typing import Optional
+from typing import TYPE_CHECKING, Deque, Final, Optional, Union
 
 import numpy as np
-import sounddevice as sd
 
 from core.config import config
+from utils.device_cache import device_cache
+
+if TYPE_CHECKING:
+    import sounddevice as sd
+
+AUDIO_QUEUE_MAXLEN: Final[int] = 100
+BRIDGE_BLOCKSIZE: Final[int] = 2048
+BridgeStream = Union["sd.Stream", "sd.InputStream", "sd.OutputStream"]
+
+logger = logging.getLogger(__name__)
 
 
 class MicrophoneToVirtualCableBridge:
     """Bridge that forwards microphone audio to a virtual cable output."""
 
+    __slots__ = (
+        "_mic_name",
+        "_virtual_output_name",
+        "_sample_rate",
+        "_input_index",
+        "_output_index",
+        "_input_stream",
+        "_output_stream",
+        "_duplex_stream",
+        "_audio_queue",
+        "_remainder",
+        "_running",
+    )
+
     def __init__(self, mic_name: str, virtual_output_name: str) -> None:
         """Initialize the microphone to virtual cable bridge.
 
@@ -19,21 +42,31 @@ class MicrophoneToVirtualCableBridge:
             mic_name: Name of the microphone input device.
             virtual_output_name: Name of the virtual output device.
         """
-        self._logger = logging.getLogger(self.__class__.__name__)
         self._mic_name = mic_name
         self._virtual_output_name = virtual_output_name
 
         self._sample_rate: int = config.microphone_sample_rate
         self._input_index: Optional[int] = None
         self._output_index: Optional[int] = None
-        self._input_stream: Optional[sd.InputStream] = None
-        self._output_stream: Optional[sd.OutputStream] = None
-        self._audio_queue: queue.Queue[np.ndarray] = queue.Queue(maxsize=100)
-        self._frames_forwarded: int = 0
+        self._input_stream: Optional["sd.InputStream"] = None
+        self._output_stream: Optional["sd.OutputStream"] = None
+        self._duplex_stream: Optional["sd.Stream"] = None
+        self._audio_queue: Deque[np.ndarray] = collections.deque(
+            maxlen=AUDIO_QUEUE_MAXLEN,)
+        self._remainder: Optional[np.ndarray] = None
         self._running: bool = False
 
-    async def start(self) -> None:
-        """Start the audio bridge between microphone and virtual cable."""
+    def prepare(self) -> bool:
+        """Resolve the devices and open the streams without starting them.
+
+        Opening PortAudio streams takes a while, so callers can do it ahead
+        of time, e.g. while the prompt audio is being generated.
+
+        Returns:
+            True if the streams are open and ready to start.
+        """
+        if self._duplex_stream or self._input_stream:
+            return True
         self._input_index = self.__find_device_index(
             self._mic_name,
             is_input=True,
@@ -43,81 +76,156 @@ class MicrophoneToVirtualCableBridge:
             is_input=False,
         )
         if self._input_index is None or self._output_index is None:
-            self._logger.error(
-                f"Could not initialize audio bridge. "
-                f"Input index: {self._input_index}, "
-                f"Output index: {self._output_index}",)
-            return
+            logger.error(
+                "Could not initialize audio bridge. "
+                "Input index: %s, Output index: %s",
+                self._input_index,
+                self._output_index,
+            )
+            return False
         self.__setup_streams()
+        return True
+
+    def start(self) -> None:
+        """Start the audio bridge between microphone and virtual cable."""
+        if not self.prepare():
+            return
         try:
-            self._input_stream.start()
-            self._output_stream.start()
+            if self._duplex_stream:
+                self._duplex_stream.start()
+            else:
+                self._input_stream.start()
+                self._output_stream.start()
             self._running = True
         except Exception as exception:  # pylint: disable=broad-exception-caught
-            self._logger.exception(
-                f"Failed to start microphone bridge: {exception}",)
+            logger.exception("Failed to start microphone bridge: %s", exception)
 
-    async def stop(self) -> None:
+    def stop(self) -> None:
         """Stop the audio bridge and clean up resources."""
         try:
-            if self._input_stream:
-                self._input_stream.stop()
-                self._input_stream.close()
-                self._input_stream = None
-            if self._output_stream:
-                self._output_stream.stop()
-                self._output_stream.close()
-                self._output_stream = None
+            self.__close_stream(self._duplex_stream)
+            self._duplex_stream = None
+            self.__close_stream(self._input_stream)
+            self._input_stream = None
+            self.__close_stream(self._output_stream)
+            self._output_stream = None
+            self._remainder = None
             self._running = False
         except Exception as exception:  # pylint: disable=broad-exception-caught
-            self._logger.exception(
-                f"Error occurred while stopping microphone bridge: {exception}",
+            logger.exception(
+                "Error occurred while stopping microphone bridge: %s",
+                exception,
             )
 
+    @staticmethod
+    def __close_stream(stream: Optional[BridgeStream]) -> None:
+        """Stop and close a stream if it is open.
+
+        Args:
+            stream: Stream to close, or None if it was never opened.
+        """
+        if stream:
+            stream.stop()
+            stream.close()
+
     def __setup_streams(self) -> None:
-        """Set up input and output audio streams with callbacks."""
+        """Set up the audio streams, preferring a single duplex stream."""
+        if not self.__setup_duplex_stream():
+            self.__setup_queued_streams()
+
+    def __setup_duplex_stream(self) -> bool:
+        """Set up one duplex stream that copies input straight to output.
+
+        A duplex stream is only possible when both devices belong to the
+        same host API; it avoids the queue hop between two callbacks.
+
+        Returns:
+            True if the duplex stream was opened, False otherwise.
+        """
+        import sounddevice as sd  # pylint: disable=import-outside-toplevel
+
+        devices = device_cache.get_devices()
+        if (devices[self._input_index]["hostapi"]
+                != devices[self._output_index]["hostapi"]):
+            return False
+
+        def duplex_callback(indata, outdata, _frames, _time, status):
+            if status:
+                logger.warning("Mic bridge stream warning: %s", status)
+            np.copyto(outdata, indata)
+
+        try:
+            self._duplex_stream = sd.Stream(
+                samplerate=self._sample_rate,
+                channels=1,
+                blocksize=BRIDGE_BLOCKSIZE,
+                device=(self._input_index, self._output_index),
+                extra_settings=(
+                    device_cache.extra_settings(self._input_index),
+                    device_cache.extra_settings(self._output_index),
+                ),
+                callback=duplex_callback,
+            )
+        except sd.PortAudioError as exception:
+            logger.debug(
+                "Duplex stream unavailable, using separate streams: %s",
+                exception,
+            )
+            return False
+        return True
+
+    def __setup_queued_streams(self) -> None:
+        """Set up input and output audio streams joined by a queue."""
+        import sounddevice as sd  # pylint: disable=import-outside-toplevel
 
         def input_callback(indata, _frames, _time, status):
             if status:
-                self._logger.warning(f"Mic input stream warning: {status}")
-            try:
-                self._audio_queue.put_nowait(indata.copy())
-            except queue.Full:
-                self._logger.warning(
+                logger.warning("Mic input stream warning: %s", status)
+            if len(self._audio_queue) >= AUDIO_QUEUE_MAXLEN:
+                logger.warning(
                     "Microphone audio queue overflow — dropping frames!",)
+            self._audio_queue.append(indata.copy())
 
         def output_callback(outdata, frames, _time, _status):
-            chunk = np.zeros((frames, 1), dtype=np.float32)
+            if self._remainder is None and not self._audio_queue:
+                outdata.fill(0)
+                return
             filled = 0
-            try:
-                while filled < frames:
-                    data = self._audio_queue.get_nowait()
-                    samples_available = data.shape[0]
-                    samples_needed = frames - filled
-                    if samples_available > samples_needed:
-                        chunk[filled:] = data[:samples_needed]
-                        remaining = data[samples_needed:]
-                        self._audio_queue.queue.appendleft(remaining)
-                        filled = frames
-                    else:
-                        chunk[filled:filled + samples_available] = data
-                        filled += samples_available
-            except queue.Empty:
-                pass
-            outdata[:] = chunk
+            while filled < frames:
+                data = self._remainder
+                if data is not None:
+                    self._remainder = None
+                else:
+                    try:
+                        data = self._audio_queue.popleft()
+                    except IndexError:
+                        break
+                samples_available = data.shape[0]
+                samples_needed = frames - filled
+                if samples_available > samples_needed:
+                    np.copyto(outdata[filled:], data[:samples_needed])
+                    self._remainder = data[samples_needed:]
+                    filled = frames
+                else:
+                    np.copyto(outdata[filled:filled + samples_available], data)
+                    filled += samples_available
+            if filled < frames:
+                outdata[filled:].fill(0)
 
         self._input_stream = sd.InputStream(
             samplerate=self._sample_rate,
             channels=1,
-            blocksize=2048,
+            blocksize=BRIDGE_BLOCKSIZE,
             device=self._input_index,
+            extra_settings=device_cache.extra_settings(self._input_index),
             callback=input_callback,
         )
         self._output_stream = sd.OutputStream(
             samplerate=self._sample_rate,
             channels=1,
-            blocksize=2048,
+            blocksize=BRIDGE_BLOCKSIZE,
             device=self._output_index,
+            extra_settings=device_cache.extra_settings(self._output_index),
             callback=output_callback,
         )
 
@@ -132,10 +240,4 @@ class MicrophoneToVirtualCableBridge:
         Returns:
             Device index if found, None otherwise.
         """
-        for i, device in enumerate(sd.query_devices()):
-            if name.lower().strip() == device["name"].lower().strip():
-                if is_input and device["max_input_channels"] > 0:
-                    return i
-                if not is_input and device["max_output_channels"] > 0:
-                    return i
-        return None
+        return device_cache.find_index(name, is_input=is_input, exact=True)
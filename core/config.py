@@ -1,12 +1,15 @@
 """Application configuration management."""
 import os
+from functools import cached_property
 from pathlib import Path
 from typing import Final, Optional
 
-import sounddevice as sd
 from dotenv import load_dotenv
 
 from utils.audio_device_utils import AudioDeviceUtils
+from utils.device_cache import device_cache
+
+TRUTHY_ENV_VALUES: Final[frozenset] = frozenset({"1", "true", "yes", "on"})
 
 
 class AppConfig:
@@ -43,9 +46,20 @@ class AppConfig:
                 "OPENAI_TTS_CHAR_LIMIT",
                 "4096",
             ))
-
-        self.microphone_name: Final[
-            Optional[str]] = self.__resolve_microphone_name()
+        self.openai_tts_concurrency: Final[int] = max(
+            1,
+            int(os.getenv(
+                "OPENAI_TTS_CONCURRENCY",
+                "4",
+            )),
+        )
+        self.openai_max_connections: Final[int] = max(
+            1,
+            int(os.getenv(
+                "OPENAI_MAX_CONNECTIONS",
+                "64",
+            )),
+        )
 
         self.virtual_output_name: Final[Optional[str]] = os.getenv(
             "VIRTUAL_OUTPUT_NAME",
@@ -55,15 +69,30 @@ class AppConfig:
             "VIRTUAL_INPUT_NAME",
             "CABLE Output (VB-Audio Virtual Cable)",
         )
-        self.microphone_sample_rate: Final[
-            int] = AudioDeviceUtils.get_input_device_samplerate(
-                self.microphone_name,)
-
         self.bot_output_device: Final[Optional[str]] = os.getenv(
             "BOT_OUTPUT_DEVICE",)
 
         _debug_env = os.getenv("DEBUG", "0").lower()
-        self.debug: Final[bool] = _debug_env in {"1", "true", "yes", "on"}
+        self.debug: Final[bool] = _debug_env in TRUTHY_ENV_VALUES
+
+    @cached_property
+    def microphone_name(self) -> Optional[str]:
+        """Microphone device name, resolved on first access.
+
+        Returns:
+            Microphone device name if found, None otherwise.
+        """
+        return self.__resolve_microphone_name()
+
+    @cached_property
+    def microphone_sample_rate(self) -> int:
+        """Microphone sample rate, queried from the device on first access.
+
+        Returns:
+            Default sample rate of the configured microphone.
+        """
+        return AudioDeviceUtils.get_input_device_samplerate(
+            self.microphone_name,)
 
     @staticmethod
     def __resolve_microphone_name() -> Optional[str]:
@@ -76,12 +105,14 @@ class AppConfig:
         if mic_name:
             return mic_name
 
+        import sounddevice as sd  # pylint: disable=import-outside-toplevel
+
         # noinspection PyBroadException
         try:
             default_input_index = sd.default.device[0]
             if default_input_index == -1:
                 return None
-            device_info = sd.query_devices(default_input_index)
+            device_info = device_cache.get_devices()[int(default_input_index)]
             return device_info.get("name")
         except Exception:  # pylint: disable=broad-exception-caught
             return None
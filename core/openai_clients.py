@@ -0,0 +1,44 @@
+"""Process-wide OpenAI clients shared by the services."""
+import functools
+from typing import Final
+
+import httpx
+from openai import AsyncOpenAI
+
+from core.config import config
+
+REQUEST_TIMEOUT: Final[float] = 30.0
+
+
+def _connection_limits() -> httpx.Limits:
+    """Build the connection pool limits of the shared client.
+
+    Every pooled connection may stay alive, so bursts of concurrent
+    requests reuse their TLS sessions afterwards.
+
+    Returns:
+        Limits for the shared HTTP connection pool.
+    """
+    return httpx.Limits(
+        max_keepalive_connections=config.openai_max_connections,
+        max_connections=config.openai_max_connections,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def async_client() -> AsyncOpenAI:
+    """Return the shared asynchronous OpenAI client.
+
+    Sharing one client lets every service reuse the same pool of
+    keep-alive TLS connections.
+
+    Returns:
+        The process-wide AsyncOpenAI client.
+    """
+    return AsyncOpenAI(
+        api_key=config.openai_api_key,
+        http_client=httpx.AsyncClient(
+            limits=_connection_limits(),
+            timeout=REQUEST_TIMEOUT,
+        ),
+    )
@@ -2,16 +2,14 @@
 import logging
 from typing import Optional
 
-import sounddevice as sd
+from utils.device_cache import device_cache
+
+logger = logging.getLogger(__name__)
 
 
 class AudioRoutingService:
     """Service for routing audio input and output to specific devices."""
 
-    def __init__(self) -> None:
-        """Initialize the audio routing service."""
-        self.__logger = logging.getLogger(self.__class__.__name__)
-
     def route_audio_input(self, source_name: str) -> None:
         """Route audio input to the specified device.
 
@@ -21,9 +19,11 @@ class AudioRoutingService:
         Raises:
             RuntimeError: If the input device is not found.
         """
+        import sounddevice as sd  # pylint: disable=import-outside-toplevel
+
         idx = self.__find_device_index_by_name(source_name, is_input=True)
         if idx is None:
-            self.__logger.error(f"Failed to find input device: {source_name}")
+            logger.error("Failed to find input device: %s", source_name)
             raise RuntimeError(f"Audio input device not found: {source_name}")
         sd.default.device = (idx, sd.default.device[1])
 
@@ -36,9 +36,11 @@ class AudioRoutingService:
         Raises:
             RuntimeError: If the output device is not found.
         """
+        import sounddevice as sd  # pylint: disable=import-outside-toplevel
+
         idx = self.__find_device_index_by_name(output_name, is_input=False)
         if idx is None:
-            self.__logger.error(f"Failed to find output device: {output_name}")
+            logger.error("Failed to find output device: %s", output_name)
             raise RuntimeError(f"Audio output device not found: {output_name}")
         sd.default.device = (sd.default.device[0], idx)
 
@@ -53,11 +55,4 @@ class AudioRoutingService:
         Returns:
             Device index if found, None otherwise.
         """
-        if not name:
-            return None
-        for idx, info in enumerate(sd.query_devices()):
-            if name.lower() in info["name"].lower() and (
-                    info["max_input_channels"] > 0
-                    if is_input else info["max_output_channels"] > 0):
-                return idx
-        return None
+        return device_cache.find_index(name, is_input=is_input)
@@ -1,6 +1,8 @@
 """Conversation service for managing jailbreak flow and audio interactions."""
 import asyncio
 import logging
+import signal
+import threading
 
 from adapters.audio_player_adapter import AudioPlayerAdapter
 from bridge.mic_to_virtual_bridge import MicrophoneToVirtualCableBridge
@@ -28,7 +30,8 @@ class ConversationService:
         self.__logger = logging.getLogger(self.__class__.__name__)
         self.__audio_router = AudioRoutingService()
         self.__tts_service = TTSService()
-        self.__stt_service = STTService()
+        # Only the evaluation flow records, so only it prewarms the input.
+        self.__stt_service = STTService(prewarm=not bypass_jailbreak_result)
         self.__evaluation_service = JailbreakEvaluationService()
         self.__player = AudioPlayerAdapter()
         self.__mic_bridge = MicrophoneToVirtualCableBridge(
@@ -53,11 +56,11 @@ class ConversationService:
             await self.__execute_jailbreak_flow(prompt_text)
         except KeyboardInterrupt:
             self.__logger.info("🛑 Application interrupted by user")
-            await self.__mic_bridge.stop()
+            self.__mic_bridge.stop()
             raise
         except Exception as exception:
             self.__logger.exception(f"Unexpected error: {exception}")
-            await self.__mic_bridge.stop()
+            self.__mic_bridge.stop()
             raise
 
     async def __execute_jailbreak_flow(self, prompt_text: str) -> None:
@@ -74,7 +77,7 @@ class ConversationService:
         await self.__generate_and_play_prompt(prompt_text)
         self.__logger.info("▶️ Playing jailbreak prompt audio...")
         self.__logger.info("⏳ Starting microphone-to-virtual-cable bridge...")
-        await self.__mic_bridge.start()
+        self.__mic_bridge.start()
 
         if self.__bypass_jailbreak_result:
             self.__logger.info(
@@ -115,22 +118,48 @@ class ConversationService:
         Args:
             prompt_text: Text to convert to speech and play.
         """
-        audio_path = config.audio_output_dir / "jailbreak_prompt.wav"
-        cache_used = await self.__tts_service.generate_audio(
-            prompt_text,
-            audio_path,
+        self.__logger.info("🔈 Routing audio devices and waiting for silence...")
+        # Device routing and opening the bridge streams do not depend on the
+        # prompt audio, so they overlap with TTS generation.
+        # All three run to completion before a failure is raised, so a TTS
+        # error cannot leave the bridge streams opening in the background.
+        results = await asyncio.gather(
+            self.__tts_service.generate_audio(
+                prompt_text,
+                config.audio_output_dir,
+            ),
+            asyncio.to_thread(self.__route_audio_devices),
+            asyncio.to_thread(self.__mic_bridge.prepare),
+            return_exceptions=True,
         )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        cache_used, prompt_audio = results[0]
         if cache_used:
             self.__logger.info("💾 Using cached prompt audio.")
         else:
             self.__logger.info("🆕 Prompt audio generated via TTS.")
-        self.__logger.info("🔈 Routing audio devices and waiting for silence...")
-        self.__audio_router.route_audio_output(config.virtual_output_name)
-        self.__audio_router.route_audio_input(config.virtual_input_name)
         self.__logger.info("🤫 Waiting for silence on virtual input...")
         await self.__silence_waiter.wait_for_silence()
         self.__logger.info("▶️ Playing jailbreak prompt audio...")
-        self.__player.play_audio(audio_path)
+        # Playback runs in a worker thread, which neither Ctrl+C nor task
+        # cancellation can interrupt, so it is stopped through an event.
+        stop_playback = threading.Event()
+        try:
+            await asyncio.to_thread(
+                self.__player.play_audio_bytes,
+                prompt_audio,
+                stop_playback,
+            )
+        except asyncio.CancelledError:
+            stop_playback.set()
+            raise
+
+    def __route_audio_devices(self) -> None:
+        """Route the default audio devices to the virtual cable."""
+        self.__audio_router.route_audio_output(config.virtual_output_name)
+        self.__audio_router.route_audio_input(config.virtual_input_name)
 
     async def __record_and_transcribe_response(self) -> str:
         """Record and transcribe the model's response.
@@ -174,16 +203,31 @@ class ConversationService:
             self.__logger.info(
                 "⛔️ Jailbreak attempt failed or was rejected. "
                 "Stopping audio bridge.",)
-            await self.__mic_bridge.stop()
+            self.__mic_bridge.stop()
 
     async def __maintain_mic_forwarding(self) -> None:
         """Maintain microphone forwarding until interrupted."""
         self.__logger.info(
             "🟢 Microphone forwarding is active. Press Ctrl+C to stop.",)
+        loop = asyncio.get_running_loop()
+        stop_event = asyncio.Event()
+        # asyncio.run installs its own SIGINT handler, which
+        # remove_signal_handler would not put back.
+        previous_handler = signal.getsignal(signal.SIGINT)
         try:
-            while True:
-                await asyncio.sleep(1)
-        except KeyboardInterrupt:
-            self.__logger.info("🛑 Microphone forwarding stopped (Ctrl+C).")
+            loop.add_signal_handler(signal.SIGINT, stop_event.set)
+            signal_handler_installed = True
+        except RuntimeError:
+            # Not supported by the Windows event loops; there asyncio.run
+            # turns Ctrl+C into cancellation of the main task, which ends
+            # the wait below with CancelledError.
+            signal_handler_installed = False
+        try:
+            await stop_event.wait()
         finally:
-            await self.__mic_bridge.stop()
+            if signal_handler_installed:
+                loop.remove_signal_handler(signal.SIGINT)
+                if previous_handler is not None:
+                    signal.signal(signal.SIGINT, previous_handler)
+            self.__mic_bridge.stop()
+            self.__logger.info("🛑 Microphone forwarding stopped (Ctrl+C).")
@@ -1,37 +1,53 @@
 """Speech-to-text service using OpenAI Whisper API."""
+import asyncio
 import logging
-import time
 from pathlib import Path
-from typing import Final, List
+from typing import Final, Optional
 
 import numpy as np
-import sounddevice as sd
-from openai import AsyncOpenAI
-from scipy.io.wavfile import write as wav_write
 
 from core.config import config
+from core.openai_clients import async_client
+from utils.device_cache import device_cache
+
+SILENCE_THRESHOLD: Final[int] = 500
+SILENCE_DURATION_LIMIT: Final[float] = 1.5
+FRAME_DURATION: Final[float] = 0.1
+SILENCE_FRAME_COUNT: Final[int] = int(SILENCE_DURATION_LIMIT / FRAME_DURATION)
+# Extra time allowed on top of max_duration before capture is abandoned.
+CAPTURE_TIMEOUT_GRACE: Final[float] = 2.0
+DEFAULT_SAMPLE_RATE: Final[int] = 44100
 
 
 class STTService:
     """Service for speech-to-text transcription using OpenAI Whisper API."""
 
-    def __init__(self) -> None:
-        """Initialize the STT service."""
+    def __init__(self, prewarm: bool = True) -> None:
+        """Initialize the STT service.
+
+        Args:
+            prewarm: Whether to open and close the input stream once so the
+                first recording does not pay the device start-up latency.
+        """
         self.__logger = logging.getLogger(self.__class__.__name__)
 
         if not config.openai_api_key:
             raise ValueError("OPENAI_API_KEY is not set in the environment.")
 
-        self.__client = AsyncOpenAI(api_key=config.openai_api_key)
+        self.__client = async_client()
         self.__model: Final[str] = config.transcription_model
         self.__input_device_index: Final[
             int] = self.__resolve_input_device_index()
+        self.__recording_buffer: Optional[np.ndarray] = None
+        self.__scratch_buffer: Optional[np.ndarray] = None
+        if prewarm:
+            self.__prewarm_input_stream()
 
     async def record_audio(
         self,
         output_path: Path,
         max_duration: int = 10,
-        sample_rate: int = 44100,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
     ) -> None:
         """Record audio with silence detection.
 
@@ -42,7 +58,7 @@ class STTService:
         """
         output_path.parent.mkdir(parents=True, exist_ok=True)
         try:
-            recorded_data = self.__capture_with_silence_detection(
+            recorded_data = await self.__capture_with_silence_detection(
                 max_duration=max_duration,
                 sample_rate=sample_rate,
             )
@@ -72,23 +88,27 @@ class STTService:
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file does not exist: {audio_path}")
         try:
-            with audio_path.open("rb") as file_handle:
-                response = await self.__client.audio.transcriptions.create(
-                    file=file_handle,
-                    model=self.__model,
-                )
+            audio_bytes = await asyncio.to_thread(audio_path.read_bytes)
+            response = await self.__client.audio.transcriptions.create(
+                file=(audio_path.name, audio_bytes, "audio/wav"),
+                model=self.__model,
+            )
             return response.text.strip()
         except Exception:
             self.__logger.exception("Transcription failed")
             raise
 
-    def __capture_with_silence_detection(
+    async def __capture_with_silence_detection(
         self,
         max_duration: int,
         sample_rate: int,
     ) -> np.ndarray:
         """Capture audio with automatic silence detection.
 
+        Frames are written by the PortAudio callback straight into one
+        preallocated buffer; the callback also tracks silence and wakes the
+        coroutine once the recording is complete.
+
         Args:
             max_duration: Maximum recording duration in seconds.
             sample_rate: Audio sample rate.
@@ -96,37 +116,110 @@ class STTService:
         Returns:
             Recorded audio data as numpy array.
         """
-        silence_threshold = 500
-        silence_duration_limit = 1.5
-        frame_duration = 0.1
-        frame_size = int(sample_rate * frame_duration)
-        silence_frame_count = int(silence_duration_limit / frame_duration)
-
-        recorded: List[np.ndarray] = []
+        import sounddevice as sd  # pylint: disable=import-outside-toplevel
+
+        frame_size = int(sample_rate * FRAME_DURATION)
+        # Comparing the sum avoids a float mean over every block.
+        silence_sum_limit = SILENCE_THRESHOLD * frame_size
+
+        capacity = max_duration * sample_rate
+        # Buffers are kept across recordings and only grow; the returned
+        # view is saved before the next recording starts.
+        self.__recording_buffer = self.__reuse_buffer(self.__recording_buffer,
+                                                      capacity)
+        # The scratch is int32 because abs(-32768) does not fit in int16.
+        self.__scratch_buffer = self.__reuse_buffer(self.__scratch_buffer,
+                                                    frame_size, np.int32)
+        recorded = self.__recording_buffer
+        scratch = self.__scratch_buffer[:frame_size]
+        written = 0
         silent_chunks = 0
-        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        finished = asyncio.Event()
+
+        def callback(indata, frames, _time, _status):
+            nonlocal written, silent_chunks
+            samples = indata[:, 0]
+            count = min(frames, capacity - written)
+            np.copyto(recorded[written:written + count], samples[:count])
+            written += count
+
+            level = np.abs(samples, out=scratch, dtype=np.int32).sum()
+            if level < silence_sum_limit:
+                silent_chunks += 1
+            else:
+                silent_chunks = 0
+            if silent_chunks >= SILENCE_FRAME_COUNT or written >= capacity:
+                loop.call_soon_threadsafe(finished.set)
+                raise sd.CallbackStop
+
         stream = sd.InputStream(
             samplerate=sample_rate,
             channels=1,
             dtype="int16",
             blocksize=frame_size,
             device=self.__input_device_index,
+            extra_settings=device_cache.extra_settings(
+                self.__input_device_index),
+            callback=callback,
         )
         with stream:
-            while True:
-                data, _ = stream.read(frame_size)
-                recorded.append(data.copy())
-                amplitude = np.abs(data).mean()
-                is_silent = amplitude < silence_threshold
-                if is_silent:
-                    silent_chunks += 1
-                else:
-                    silent_chunks = 0
-                if silent_chunks >= silence_frame_count or (time.time() -
-                                                            start_time
-                                                            > max_duration):
-                    break
-        return np.concatenate(recorded, axis=0)
+            try:
+                # The sample count normally ends the recording; the
+                # loop's monotonic clock only guards against a stalled
+                # device that stops delivering callbacks.
+                await asyncio.wait_for(
+                    finished.wait(),
+                    timeout=max_duration + CAPTURE_TIMEOUT_GRACE,
+                )
+            except asyncio.TimeoutError:
+                self.__logger.warning(
+                    "Input stream stalled; keeping the audio captured so far.",)
+        return recorded[:written]
+
+    def __prewarm_input_stream(self) -> None:
+        """Open the input device once and read a single frame.
+
+        PortAudio initializes the device, and Bluetooth inputs ramp up their
+        buffers, on the first stream; doing it here keeps that latency out
+        of the first recording's silence detection.
+        """
+        import sounddevice as sd  # pylint: disable=import-outside-toplevel
+
+        frame_size = int(DEFAULT_SAMPLE_RATE * FRAME_DURATION)
+        try:
+            with sd.InputStream(
+                    samplerate=DEFAULT_SAMPLE_RATE,
+                    channels=1,
+                    dtype="int16",
+                    blocksize=frame_size,
+                    device=self.__input_device_index,
+                    extra_settings=device_cache.extra_settings(
+                        self.__input_device_index),
+            ) as stream:
+                stream.read(frame_size)
+        except Exception as exception:  # pylint: disable=broad-exception-caught
+            self.__logger.debug(f"Input stream prewarm skipped: {exception}")
+
+    @staticmethod
+    def __reuse_buffer(
+        buffer: Optional[np.ndarray],
+        size: int,
+        dtype: type = np.int16,
+    ) -> np.ndarray:
+        """Return ``buffer`` if it holds ``size`` samples, else a new one.
+
+        Args:
+            buffer: Previously allocated buffer of ``dtype``, if any.
+            size: Number of samples required.
+            dtype: Sample type of a newly allocated buffer.
+
+        Returns:
+            A buffer with at least ``size`` samples.
+        """
+        if buffer is None or buffer.shape[0] < size:
+            return np.empty(size, dtype=dtype)
+        return buffer
 
     @staticmethod
     def __resolve_input_device_index() -> int:
@@ -139,11 +232,10 @@ class STTService:
             RuntimeError: If device is not found.
         """
         device_name = config.virtual_input_name
-        for idx, device in enumerate(sd.query_devices()):
-            if device_name and device_name.lower() in device["name"].lower(
-            ) and device["max_input_channels"] > 0:
-                return idx
-        raise RuntimeError(f"Device '{device_name}' not found.")
+        idx = device_cache.find_index(device_name, is_input=True)
+        if idx is None:
+            raise RuntimeError(f"Device '{device_name}' not found.")
+        return idx
 
     @staticmethod
     def __save_recording_to_file(
@@ -158,4 +250,6 @@ class STTService:
             path: Path where to save the file.
             sample_rate: Audio sample rate.
         """
-        wav_write(path, sample_rate, data)
+        import soundfile as sf  # pylint: disable=import-outside-toplevel
+
+        sf.write(str(path), data, sample_rate, subtype="PCM_16")
@@ -4,17 +4,44 @@ This module provides a service to convert long texts into audio files
 by chunking the text, generating audio for each chunk, and concatenating
 the results.
 """
+import asyncio
+import functools
 import hashlib
+import io
 import logging
-import shutil
-import tempfile
+import os
+import re
 from pathlib import Path
-from typing import Final, List
+from typing import Dict, Final, List, Set, Tuple
 
-from openai import OpenAI
+from openai import RateLimitError
 from pydub import AudioSegment
 
 from core.config import config
+from core.openai_clients import async_client
+from utils.rate_limiter import AdaptiveConcurrencyLimiter
+
+# Rate-limited chunk requests are retried this many times after the SDK's
+# own retries are exhausted.
+RATE_LIMIT_RETRIES: Final[int] = 3
+# Whitespace that follows a sentence-ending ".", "!" or "?".
+SENTENCE_BOUNDARY_PATTERN: Final[re.Pattern] = re.compile(r"(?<=[.!?])\s+")
+# Formats made of self-contained frames, whose files can be joined as bytes.
+BYTE_CONCATENABLE_FORMATS: Final[frozenset] = frozenset({"mp3"})
+TTS_CHUNK_CACHE_MAX_ENTRIES: Final[int] = 512
+
+
+@functools.lru_cache(maxsize=256)
+def _prompt_digest(text: str) -> str:
+    """Computes the cache key of a prompt or chunk, memoized per process.
+
+    Args:
+        text (str): The prompt text, or the chunk text with its settings.
+
+    Returns:
+        str: Hex digest identifying the text.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
 
 
 class TTSService:
@@ -30,17 +57,24 @@ class TTSService:
         if not config.openai_api_key:
             raise ValueError("OPENAI_API_KEY is not set in the environment.")
 
-        self.__client = OpenAI(api_key=config.openai_api_key)
+        self.__client = async_client()
         self.__model: Final[str] = config.openai_tts_model
         self.__voice: Final[str] = config.openai_tts_voice
         self.__format: Final[str] = config.openai_tts_output_format
         self.__api_char_limit: Final[int] = config.openai_tts_char_limit
+        self.__rate_limiter = AdaptiveConcurrencyLimiter(
+            max_concurrency=config.openai_tts_concurrency,)
+        self.__chunk_cache_dir: Final[Path] = (config.audio_output_dir /
+                                               "tts_chunks")
+        self.__cache: Dict[str, bytes] = {}
+        self.__pending_writes: Set["asyncio.Task[None]"] = set()
 
     def __chunk_text(self, text: str) -> List[str]:
         """Splits a long text into chunks that respect the API character limit.
 
-        The method splits text primarily by sentences, then falls back to new
-        lines or spaces to ensure no chunk exceeds the limit.
+        The method packs whole sentences (ending in ".", "!" or "?") into
+        chunks greedily, then falls back to spaces to ensure no chunk
+        exceeds the limit.
 
         Args:
             text (str): The input text to be split.
@@ -48,23 +82,25 @@ class TTSService:
         Returns:
             List[str]: A list of text chunks, each smaller than the API limit.
         """
-        chunks = []
-        current_chunk = ""
-        sentences = text.replace("!", "!.").replace("?", "?. ").split(". ")
-
-        for sentence in sentences:
+        chunks: List[str] = []
+        current_sentences: List[str] = []
+        current_length = 0
+        for sentence in SENTENCE_BOUNDARY_PATTERN.split(text.strip()):
             if not sentence:
                 continue
 
-            if len(current_chunk) + len(sentence) + 1 > self.__api_char_limit:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence + ". "
-            else:
-                current_chunk += sentence + ". "
+            added_length = len(sentence) + (1 if current_sentences else 0)
+            if (current_sentences and
+                    current_length + added_length > self.__api_char_limit):
+                chunks.append(" ".join(current_sentences))
+                current_sentences = []
+                added_length = len(sentence)
+                current_length = 0
+            current_sentences.append(sentence)
+            current_length += added_length
 
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        if current_sentences:
+            chunks.append(" ".join(current_sentences))
 
         final_chunks = []
         for chunk in chunks:
@@ -74,35 +110,217 @@ class TTSService:
                     if split_pos == -1:
                         split_pos = self.__api_char_limit
                     final_chunks.append(chunk[:split_pos])
-                    chunk = chunk[split_pos:]
+                    chunk = chunk[split_pos:].lstrip()
             final_chunks.append(chunk)
 
         return [c for c in final_chunks if c]
 
-    def __generate_chunk_audio(self, text_chunk: str, file_path: Path) -> None:
-        """Generates an audio file for a single text chunk via OpenAI API.
+    async def __generate_chunk_audio(
+        self,
+        text_chunk: str,
+        store: bool = True,
+    ) -> bytes:
+        """Returns the audio for a text chunk, reusing the chunk cache.
+
+        Chunks are cached on disk by model, voice, format and text, so a
+        prompt that shares sentences with an earlier one only requests the
+        chunks that changed.
 
         Args:
             text_chunk (str): The text chunk to convert to speech.
-            file_path (Path): The path to save the generated audio file.
+            store (bool): Whether to add freshly generated audio to the
+                chunk cache.
+
+        Returns:
+            bytes: The encoded audio for the chunk.
 
         Raises:
             Exception: Propagates exceptions from the OpenAI API client.
         """
-        with self.__client.audio.speech.with_streaming_response.create(
+        chunk_key = _prompt_digest("\0".join(
+            (self.__model, self.__voice, self.__format, text_chunk)))
+        chunk_file = self.__chunk_cache_dir / f"{chunk_key}.{self.__format}"
+        try:
+            return await asyncio.to_thread(chunk_file.read_bytes)
+        except FileNotFoundError:
+            pass
+
+        audio = await self.__fetch_chunk_audio(text_chunk)
+        if not store:
+            return audio
+        try:
+            await asyncio.to_thread(self.__store_chunk_audio, chunk_file, audio)
+        except OSError as exception:
+            self.__logger.warning(
+                f"Failed to write TTS chunk cache file: {exception}")
+        return audio
+
+    def __store_chunk_audio(self, chunk_file: Path, audio: bytes) -> None:
+        """Adds a chunk to the on-disk chunk cache.
+
+        The cache is bounded by clearing it wholesale once it holds
+        ``TTS_CHUNK_CACHE_MAX_ENTRIES`` files.
+
+        Args:
+            chunk_file (Path): The cache file for the chunk.
+            audio (bytes): The encoded audio of the chunk.
+        """
+        self.__chunk_cache_dir.mkdir(parents=True, exist_ok=True)
+        cached_files = list(self.__chunk_cache_dir.glob(f"*.{self.__format}"))
+        if len(cached_files) >= TTS_CHUNK_CACHE_MAX_ENTRIES:
+            self.__logger.info("Clearing the TTS chunk cache...")
+            for cached_file in cached_files:
+                cached_file.unlink(missing_ok=True)
+        self.__write_cache_file(chunk_file, audio)
+
+    async def __fetch_chunk_audio(self, text_chunk: str) -> bytes:
+        """Requests audio for a single text chunk via OpenAI API.
+
+        Requests go through the shared rate limiter; a chunk rejected with
+        a rate-limit error is retried after the limiter has backed off.
+
+        Args:
+            text_chunk (str): The text chunk to convert to speech.
+
+        Returns:
+            bytes: The encoded audio returned by the API.
+
+        Raises:
+            Exception: Propagates exceptions from the OpenAI API client.
+        """
+        attempt = 0
+        while True:
+            async with self.__rate_limiter:
+                try:
+                    return await self.__request_chunk_audio(text_chunk)
+                except RateLimitError as exception:
+                    attempt += 1
+                    if attempt > RATE_LIMIT_RETRIES:
+                        raise
+                    self.__rate_limiter.record_rate_limited(
+                        exception.response.headers.get("retry-after"))
+
+    async def __request_chunk_audio(self, text_chunk: str) -> bytes:
+        """Streams the audio of one text chunk into memory.
+
+        Args:
+            text_chunk (str): The text chunk to convert to speech.
+
+        Returns:
+            bytes: The encoded audio returned by the API.
+        """
+        buffer = io.BytesIO()
+        async with self.__client.audio.speech.with_streaming_response.create(
                 model=self.__model,
                 voice=self.__voice,
                 input=text_chunk,
                 response_format=self.__format,
         ) as response:
-            response.stream_to_file(file_path)
+            async for data in response.iter_bytes():
+                buffer.write(data)
+            self.__rate_limiter.record_success(response.headers)
+        return buffer.getvalue()
+
+    async def __render_chunks(self, text_chunks: List[str]) -> bytes:
+        """Generates the encoded audio for all text chunks.
+
+        A single chunk, or chunks in a frame-based format such as MP3, is
+        joined as encoded bytes without decoding. Other formats are decoded,
+        concatenated and encoded again, as are joined chunks whose decoded
+        length falls short of the chunks' total.
+
+        Args:
+            text_chunks (List[str]): A list of text chunks to process.
+
+        Returns:
+            bytes: The encoded audio of the whole text.
+
+        Raises:
+            RuntimeError: If audio generation results in no processable
+                segments.
+        """
+        if (len(text_chunks) > 1 and
+                self.__format not in BYTE_CONCATENABLE_FORMATS):
+            combined_audio = await self.__process_chunks(text_chunks)
+            return await asyncio.to_thread(
+                self.__export_to_bytes,
+                combined_audio,
+            )
+
+        self.__logger.info(f"Generating audio for {len(text_chunks)} chunk(s)")
+        # The audio of a single-chunk prompt is already stored whole by the
+        # prompt cache, so it is not written to the chunk cache as well.
+        store_chunks = len(text_chunks) > 1
+        chunk_audio = await asyncio.gather(
+            *(self.__generate_chunk_audio(chunk, store_chunks)
+              for chunk in text_chunks),)
+        if not chunk_audio:
+            raise RuntimeError("Audio generation resulted in no segments.")
+        joined_audio = b"".join(chunk_audio)
+        if len(chunk_audio) == 1 or await asyncio.to_thread(
+                self.__is_joined_length_intact,
+                chunk_audio,
+                joined_audio,
+        ):
+            return joined_audio
+
+        self.__logger.warning(
+            "Joined chunk audio is incomplete; re-encoding the chunks.")
+        return await asyncio.to_thread(self.__reencode_chunks, chunk_audio)
+
+    def __is_joined_length_intact(
+        self,
+        chunk_audio: List[bytes],
+        joined_audio: bytes,
+    ) -> bool:
+        """Checks that joined chunks decode to the length of all chunks.
+
+        An MP3 chunk may start with an ID3 tag and a Xing/Info frame that
+        states the chunk's frame count. Decoders trust the first chunk's
+        header, so a joined file may stop after the first chunk.
+
+        Args:
+            chunk_audio (List[bytes]): The encoded audio of each chunk.
+            joined_audio (bytes): The chunks joined as bytes.
+
+        Returns:
+            bool: True if the joined audio holds the frames of every chunk.
+        """
+        import soundfile as sf  # pylint: disable=import-outside-toplevel
+
+        try:
+            expected_frames = sum(
+                sf.info(io.BytesIO(data)).frames for data in chunk_audio)
+            joined_frames = sf.info(io.BytesIO(joined_audio)).frames
+        except sf.LibsndfileError as exception:
+            self.__logger.debug(
+                f"Could not measure joined chunk audio: {exception}")
+            return False
+        return joined_frames == expected_frames
+
+    def __reencode_chunks(self, chunk_audio: List[bytes]) -> bytes:
+        """Decodes the chunks, concatenates them and encodes the result.
 
-    def __process_chunks(self, text_chunks: List[str]) -> AudioSegment:
+        Args:
+            chunk_audio (List[bytes]): The encoded audio of each chunk.
+
+        Returns:
+            bytes: The encoded audio of all chunks in order.
+        """
+        audio_segments = [
+            AudioSegment.from_file(io.BytesIO(data), format=self.__format)
+            for data in chunk_audio
+        ]
+        return self.__export_to_bytes(
+            self.__concatenate_segments(audio_segments))
+
+    async def __process_chunks(self, text_chunks: List[str]) -> AudioSegment:
         """Generates and concatenates audio for a list of text chunks.
 
-        This method iterates through text chunks, generating audio for each
-        in a temporary directory, and then combines them into a single
-        AudioSegment.
+        Audio for the chunks is requested concurrently, bounded by the
+        adaptive rate limiter, and decoded in worker threads as each
+        response arrives. The results are then combined in chunk order into
+        a single AudioSegment.
 
         Args:
             text_chunks (List[str]): A list of text chunks to process.
@@ -114,59 +332,158 @@ class TTSService:
             RuntimeError: If audio generation results in no processable
                 segments.
         """
-        audio_segments = []
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            for i, chunk in enumerate(text_chunks):
-                chunk_file_path = temp_path / f"chunk_{i}.{self.__format}"
-                log_msg = f"Generating audio for chunk {i+1}/{len(text_chunks)}"
-                self.__logger.info(log_msg)
 
-                self.__generate_chunk_audio(chunk, chunk_file_path)
-                segment = AudioSegment.from_file(chunk_file_path,
-                                                 format=self.__format)
-                audio_segments.append(segment)
+        async def generate(index: int, chunk: str) -> AudioSegment:
+            self.__logger.info(
+                f"Generating audio for chunk {index+1}/{len(text_chunks)}")
+            data = await self.__generate_chunk_audio(chunk)
+            # Decoding spawns ffmpeg, so it runs in a worker thread while
+            # the remaining chunks are still downloading.
+            return await asyncio.to_thread(
+                AudioSegment.from_file,
+                io.BytesIO(data),
+                format=self.__format,
+            )
+
+        audio_segments = await asyncio.gather(
+            *(generate(i, chunk) for i, chunk in enumerate(text_chunks)),)
 
         if not audio_segments:
             raise RuntimeError("Audio generation resulted in no segments.")
 
         self.__logger.info("Concatenating audio chunks...")
-        return sum(audio_segments)
+        return await asyncio.to_thread(
+            self.__concatenate_segments,
+            list(audio_segments),
+        )
+
+    @staticmethod
+    def __concatenate_segments(
+        audio_segments: List[AudioSegment],) -> AudioSegment:
+        """Joins segments by concatenating their raw PCM data once.
 
-    async def generate_audio(self, text: str, output_path: Path) -> bool:
-        """Generates an audio file from text, using cache if available.
+        Adding segments one by one copies the growing buffer on every step;
+        joining the raw frames into one buffer copies every chunk once.
+
+        Args:
+            audio_segments (List[AudioSegment]): Segments in playback order.
+
+        Returns:
+            AudioSegment: A single segment containing all the audio.
+        """
+        first = audio_segments[0]
+        frames = bytearray()
+        for segment in audio_segments:
+            if (segment.frame_rate != first.frame_rate or
+                    segment.channels != first.channels or
+                    segment.sample_width != first.sample_width):
+                segment = segment.set_frame_rate(first.frame_rate)
+                segment = segment.set_channels(first.channels)
+                segment = segment.set_sample_width(first.sample_width)
+            frames.extend(segment.raw_data)
+        # pylint: disable-next=protected-access
+        return first._spawn(bytes(frames))
+
+    def __export_to_bytes(self, audio: AudioSegment) -> bytes:
+        """Encodes an AudioSegment in the configured output format.
+
+        Args:
+            audio (AudioSegment): The audio to encode.
+
+        Returns:
+            bytes: The encoded audio file contents.
+        """
+        buffer = io.BytesIO()
+        audio.export(buffer, format=self.__format)
+        return buffer.getvalue()
+
+    def __persist_in_background(self, cache_file: Path, audio: bytes) -> None:
+        """Writes the cache file without delaying playback.
+
+        Args:
+            cache_file (Path): The cache file to write.
+            audio (bytes): The encoded audio to store.
+        """
+        task = asyncio.create_task(
+            asyncio.to_thread(self.__write_cache_file, cache_file, audio))
+        self.__pending_writes.add(task)
+        task.add_done_callback(self.__on_cache_write_done)
+
+    @staticmethod
+    def __write_cache_file(cache_file: Path, audio: bytes) -> None:
+        """Writes a cache file atomically.
+
+        The audio goes to a temporary sibling that is then renamed over the
+        cache file, so an interrupted write never leaves a truncated file
+        that later runs would treat as a cache hit.
+
+        Args:
+            cache_file (Path): The cache file to write.
+            audio (bytes): The encoded audio to store.
+        """
+        temp_file = cache_file.with_name(f"{cache_file.name}.tmp")
+        try:
+            temp_file.write_bytes(audio)
+            os.replace(temp_file, cache_file)
+        except OSError:
+            temp_file.unlink(missing_ok=True)
+            raise
+
+    def __on_cache_write_done(self, task: "asyncio.Task[None]") -> None:
+        """Releases a finished cache write and logs its failure, if any.
+
+        Args:
+            task (asyncio.Task[None]): The finished cache write.
+        """
+        self.__pending_writes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.__logger.error(
+                f"Failed to write TTS cache file: {task.exception()}")
+
+    async def generate_audio(
+        self,
+        text: str,
+        output_dir: Path,
+    ) -> Tuple[bool, bytes]:
+        """Generates audio from text, using cache if available.
 
         This is the main public method. It checks for a cached version of the
         audio first. If not found, it chunks the text, generates audio
-        for each part, combines them, saves the final file, and caches it.
+        for each part and joins them in memory. The result is returned
+        right away while the cache file is written in the background.
 
         Args:
             text (str): The full text to be converted to speech.
-            output_path (Path): The path to save the final audio file.
+            output_dir (Path): The directory holding cached prompt audio.
 
         Returns:
-            bool: True if a cached audio file was used, False otherwise.
+            Tuple[bool, bytes]: Whether cached audio was used, and the
+                encoded audio for the text.
 
         Raises:
             Exception: If any part of the audio generation or file handling
                 fails.
         """
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        prompt_hash: str = hashlib.sha256(text.encode("utf-8")).hexdigest()
-        cache_file_name = f"jailbreak_prompt_{prompt_hash}.{self.__format}"
-        cache_file: Path = output_path.parent / cache_file_name
+        prompt_hash: str = _prompt_digest(text)
+        cached_audio = self.__cache.get(prompt_hash)
+        if cached_audio is not None:
+            return True, cached_audio
 
+        output_dir.mkdir(parents=True, exist_ok=True)
+        cache_file_name = f"jailbreak_prompt_{prompt_hash}.{self.__format}"
+        cache_file = output_dir / cache_file_name
         if cache_file.exists():
-            shutil.copy(cache_file, output_path)
-            return True
+            cached_audio = await asyncio.to_thread(cache_file.read_bytes)
+            self.__cache[prompt_hash] = cached_audio
+            return True, cached_audio
 
         text_chunks = self.__chunk_text(text)
         try:
-            combined_audio = self.__process_chunks(text_chunks)
-            combined_audio.export(output_path, format=self.__format)
+            audio = await self.__render_chunks(text_chunks)
         except Exception:
             self.__logger.exception("Failed to generate audio with OpenAI TTS.")
             raise
 
-        shutil.copy(output_path, cache_file)
-        return False
+        self.__cache[prompt_hash] = audio
+        self.__persist_in_background(cache_file, audio)
+        return False, audio
@@ -1,7 +1,9 @@
 """Audio device utilities for querying device properties."""
-from typing import Optional
+from typing import Final, Optional
 
-import sounddevice as sd
+from utils.device_cache import device_cache
+
+DEFAULT_SAMPLE_RATE: Final[int] = 44100
 
 
 class AudioDeviceUtils:
@@ -18,13 +20,14 @@ class AudioDeviceUtils:
             Sample rate of the device, defaults to 44100 if not found.
         """
         if not device_name:
-            return 44100
+            return DEFAULT_SAMPLE_RATE
+
+        idx = device_cache.find_index(device_name, is_input=True, exact=True)
+        if idx is None:
+            return DEFAULT_SAMPLE_RATE
+        device = device_cache.get_devices()[idx]
         # noinspection PyBroadException
         try:
-            for device in sd.query_devices():
-                if device_name.lower().strip() == device["name"].lower().strip(
-                ):
-                    return int(device.get("default_samplerate", 44100))
+            return int(device.get("default_samplerate", DEFAULT_SAMPLE_RATE))
         except Exception:  # pylint: disable=broad-exception-caught  # nosec
-            pass
-        return 44100
+            return DEFAULT_SAMPLE_RATE
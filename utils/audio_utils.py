@@ -4,7 +4,8 @@ import logging
 from typing import Optional
 
 import numpy as np
-import sounddevice as sd
+
+from utils.device_cache import device_cache
 
 
 class SilenceWaiter:
@@ -32,10 +33,14 @@ class SilenceWaiter:
         self.__logger = logging.getLogger(self.__class__.__name__)
         self.__bot_output_device = bot_output_device
         self.__required_silence = required_silence
-        self.__threshold = threshold
         self.__sample_rate = sample_rate
         self.__frame_duration = frame_duration
         self.__required = required
+        self.__frame_size = int(sample_rate * frame_duration)
+        # Silence is checked against the summed amplitude of a block; the
+        # int32 buffer lets np.abs handle -32768 without overflowing.
+        self.__silence_sum_limit = threshold * self.__frame_size
+        self.__abs_buffer = np.empty((self.__frame_size, 1), dtype=np.int32)
 
     async def wait_for_silence(self) -> None:
         """Wait for silence on the configured output device.
@@ -43,6 +48,8 @@ class SilenceWaiter:
         Raises:
             RuntimeError: If bot output device is required but not set.
         """
+        import sounddevice as sd  # pylint: disable=import-outside-toplevel
+
         if not self.__bot_output_device:
             if self.__required:
                 raise RuntimeError(
@@ -51,34 +58,45 @@ class SilenceWaiter:
             return
 
         input_index = self.__find_device_index()
-        device_info = sd.query_devices(input_index)
+        device_info = device_cache.get_devices()[input_index]
         self.__logger.info(
             f"Waiting for silence on device: {device_info['name']} "
             f"(index {input_index})",)
-        frame_size = int(self.__sample_rate * self.__frame_duration)
+        frame_size = self.__frame_size
+        abs_buffer = self.__abs_buffer
         silent_frames_required = int(
             self.__required_silence / self.__frame_duration,)
         silent_counter = 0
+        log_amplitude = self.__logger.isEnabledFor(logging.DEBUG)
+        loop = asyncio.get_running_loop()
+        silence_detected = asyncio.Event()
+
+        def callback(indata, _frames, _time, _status):
+            nonlocal silent_counter
+            amplitude_sum = np.abs(indata, out=abs_buffer, dtype=np.int32).sum()
+            if log_amplitude:
+                self.__logger.debug(
+                    f"Frame amplitude: {amplitude_sum / frame_size:.2f}")
+            if amplitude_sum < self.__silence_sum_limit:
+                silent_counter += 1
+                if silent_counter >= silent_frames_required:
+                    loop.call_soon_threadsafe(silence_detected.set)
+                    raise sd.CallbackStop
+            else:
+                silent_counter = 0
+
         stream = sd.InputStream(
             samplerate=self.__sample_rate,
             channels=1,
             dtype="int16",
             blocksize=frame_size,
             device=input_index,
+            extra_settings=device_cache.extra_settings(input_index),
+            callback=callback,
         )
         with stream:
-            while True:
-                data, _ = stream.read(frame_size)
-                amplitude = np.abs(data).mean()
-                self.__logger.debug(f"Frame amplitude: {amplitude:.2f}")
-                if amplitude < self.__threshold:
-                    silent_counter += 1
-                    if silent_counter >= silent_frames_required:
-                        self.__logger.info("Silence detected.")
-                        break
-                else:
-                    silent_counter = 0
-                await asyncio.sleep(self.__frame_duration)
+            await silence_detected.wait()
+        self.__logger.info("Silence detected.")
 
     def __find_device_index(self) -> Optional[int]:
         """Find device index for the bot output device.
@@ -91,13 +109,12 @@ class SilenceWaiter:
         """
         if not self.__bot_output_device:
             return None
-        for idx, dev in enumerate(sd.query_devices()):
-            if self.__bot_output_device.lower() in dev["name"].lower(
-            ) and dev["max_output_channels"] > 0:
-                return idx
+        idx = device_cache.find_index(self.__bot_output_device, is_input=False)
+        if idx is not None:
+            return idx
         devices = [
             f"{idx}: {dev['name']}"
-            for idx, dev in enumerate(sd.query_devices())
+            for idx, dev in enumerate(device_cache.get_devices())
         ]
         error_msg = (
             f"BOT_OUTPUT_DEVICE '{self.__bot_output_device}' not found!\n"
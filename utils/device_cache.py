@@ -0,0 +1,243 @@
+"""Cached audio device enumeration shared across the application."""
+import functools
+import platform
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Final, FrozenSet, List, Optional, Tuple
+
+# Number of seconds a device snapshot stays valid.
+DEVICE_CACHE_TTL: Final[float] = 60.0
+# Host API searched first on each platform; the same physical device is
+# usually listed once per host API (e.g. MME, DirectSound, WASAPI).
+PREFERRED_HOSTAPIS: Final[Dict[str, str]] = {
+    "Windows": "Windows WASAPI",
+    "Darwin": "Core Audio",
+    "Linux": "ALSA",
+}
+WASAPI_HOSTAPI_NAME: Final[str] = "Windows WASAPI"
+# Normalized name, direction and exactness of a memoized device lookup.
+LookupKey = Tuple[str, bool, bool]
+
+
+@functools.lru_cache(maxsize=64)
+def _normalize_name(name: str) -> str:
+    """Normalize a configured device name for case-insensitive lookups.
+
+    Configured names are looked up repeatedly, so the normalized form is
+    memoized per process.
+
+    Args:
+        name: Device name as configured.
+
+    Returns:
+        Lowercased name without surrounding whitespace.
+    """
+    return name.strip().lower()
+
+
+@dataclass(frozen=True)
+class DeviceSnapshot:
+    """Audio devices reported by PortAudio at a point in time.
+
+    Besides the raw device list, the snapshot holds lowercased name indexes
+    per direction, plus the set of all normalized names, so lookups do not
+    re-normalize every device name. Devices of the platform's preferred host
+    API come first in those indexes. Resolved lookups are memoized in
+    ``lookups`` for the snapshot's lifetime.
+    """
+    timestamp: float
+    devices: Tuple[Dict[str, Any], ...]
+    hostapis: Tuple[Dict[str, Any], ...]
+    exact_inputs: Dict[str, int]
+    exact_outputs: Dict[str, int]
+    input_names: List[Tuple[str, int]]
+    output_names: List[Tuple[str, int]]
+    all_names: FrozenSet[str]
+    lookups: Dict[LookupKey, Optional[int]] = field(default_factory=dict)
+
+
+class DeviceCache:
+    """Memoizes ``sd.query_devices()`` so lookups do not re-enumerate.
+
+    Devices are enumerated once and the snapshot is kept until its TTL
+    expires or it is invalidated explicitly. PortAudio only enumerates
+    devices when it is initialized, so a refreshed snapshot lists the same
+    devices; devices connected later are not picked up.
+    """
+
+    def __init__(self, ttl: float = DEVICE_CACHE_TTL) -> None:
+        """Initialize the device cache.
+
+        Args:
+            ttl: Number of seconds a device snapshot stays valid.
+        """
+        self.__ttl: Final[float] = ttl
+        self.__snapshot: Optional[DeviceSnapshot] = None
+
+    def get_devices(self) -> Tuple[Dict[str, Any], ...]:
+        """Return the cached device list, refreshing it when stale.
+
+        Returns:
+            Devices as reported by ``sd.query_devices()``.
+        """
+        return self.__get_snapshot().devices
+
+    def get_device_names(self) -> FrozenSet[str]:
+        """Return the normalized names of all devices, in any direction.
+
+        Returns:
+            Lowercased device names without surrounding whitespace.
+        """
+        return self.__get_snapshot().all_names
+
+    def __get_snapshot(self) -> DeviceSnapshot:
+        """Return the cached snapshot, refreshing it when stale.
+
+        Returns:
+            A device snapshot younger than the configured TTL.
+        """
+        snapshot = self.__snapshot
+        if snapshot is None or self.__is_expired(snapshot):
+            snapshot = self.refresh()
+        return snapshot
+
+    def __is_expired(self, snapshot: DeviceSnapshot) -> bool:
+        """Check whether a snapshot must be refreshed.
+
+        Args:
+            snapshot: Snapshot to check.
+
+        Returns:
+            Whether the snapshot is older than the TTL.
+        """
+        return time.monotonic() - snapshot.timestamp >= self.__ttl
+
+    def refresh(self) -> DeviceSnapshot:
+        """Enumerate devices through PortAudio and store the result.
+
+        Returns:
+            The freshly captured device snapshot.
+        """
+        import sounddevice as sd  # pylint: disable=import-outside-toplevel
+
+        devices: Tuple[Dict[str, Any], ...] = tuple(sd.query_devices())
+        hostapis: Tuple[Dict[str, Any], ...] = tuple(sd.query_hostapis())
+        preferred_hostapi = self.__find_preferred_hostapi(hostapis)
+        ordered_devices = sorted(
+            enumerate(devices),
+            key=lambda item: item[1]["hostapi"] != preferred_hostapi,
+        )
+        exact_inputs: Dict[str, int] = {}
+        exact_outputs: Dict[str, int] = {}
+        input_names: List[Tuple[str, int]] = []
+        output_names: List[Tuple[str, int]] = []
+        for idx, device in ordered_devices:
+            name_lower = device["name"].lower()
+            name_key = name_lower.strip()
+            if device["max_input_channels"] > 0:
+                exact_inputs.setdefault(name_key, idx)
+                input_names.append((name_lower, idx))
+            if device["max_output_channels"] > 0:
+                exact_outputs.setdefault(name_key, idx)
+                output_names.append((name_lower, idx))
+
+        snapshot = DeviceSnapshot(
+            timestamp=time.monotonic(),
+            devices=devices,
+            hostapis=hostapis,
+            exact_inputs=exact_inputs,
+            exact_outputs=exact_outputs,
+            input_names=input_names,
+            output_names=output_names,
+            all_names=frozenset(
+                device["name"].strip().lower() for device in devices),
+        )
+        self.__snapshot = snapshot
+        return snapshot
+
+    @staticmethod
+    def __find_preferred_hostapi(
+        hostapis: Tuple[Dict[str, Any], ...],) -> Optional[int]:
+        """Find the index of the preferred host API for this platform.
+
+        Args:
+            hostapis: Host APIs as reported by ``sd.query_hostapis()``.
+
+        Returns:
+            Host API index if available, None otherwise.
+        """
+        preferred_name = PREFERRED_HOSTAPIS.get(platform.system())
+        for idx, hostapi in enumerate(hostapis):
+            if hostapi["name"] == preferred_name:
+                return idx
+        return None
+
+    def extra_settings(self, index: Optional[int]) -> Optional[Any]:
+        """Return host API specific stream settings for a device.
+
+        WASAPI shared-mode streams refuse to open at a sample rate that
+        differs from the device mix format, so WASAPI devices get
+        PortAudio's automatic sample rate conversion enabled.
+
+        Args:
+            index: Device index the stream will be opened on.
+
+        Returns:
+            Settings for the stream's ``extra_settings`` argument, or None.
+        """
+        import sounddevice as sd  # pylint: disable=import-outside-toplevel
+
+        if index is None:
+            return None
+        snapshot = self.__get_snapshot()
+        hostapi = snapshot.hostapis[snapshot.devices[index]["hostapi"]]
+        if hostapi["name"] == WASAPI_HOSTAPI_NAME:
+            return sd.WasapiSettings(auto_convert=True)
+        return None
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot so the next lookup rebuilds its indexes."""
+        self.__snapshot = None
+
+    def find_index(
+        self,
+        name: Optional[str],
+        is_input: bool,
+        exact: bool = False,
+    ) -> Optional[int]:
+        """Find device index by name and type.
+
+        Args:
+            name: Name of the device to find.
+            is_input: True for input devices, False for output devices.
+            exact: Whether the name must match exactly instead of being
+                contained in the device name. Both comparisons ignore case
+                and whitespace around the configured name.
+
+        Returns:
+            Device index if found, None otherwise.
+        """
+        if not name:
+            return None
+        needle = _normalize_name(name)
+        snapshot = self.__get_snapshot()
+        lookup_key = (needle, is_input, exact)
+        if lookup_key in snapshot.lookups:
+            return snapshot.lookups[lookup_key]
+
+        found: Optional[int] = None
+        if exact:
+            exact_index = (snapshot.exact_inputs
+                           if is_input else snapshot.exact_outputs)
+            found = exact_index.get(needle)
+        else:
+            names = snapshot.input_names if is_input else snapshot.output_names
+            found = next(
+                (idx for device_name, idx in names if needle in device_name),
+                None,
+            )
+        snapshot.lookups[lookup_key] = found
+        return found
+
+
+device_cache = DeviceCache()
@@ -3,7 +3,7 @@ import logging
 from pathlib import Path
 from typing import List
 
-import sounddevice as sd
+from utils.device_cache import device_cache
 
 
 class FileAndAudioUtils:
@@ -26,12 +26,12 @@ class FileAndAudioUtils:
             FileNotFoundError: If the file doesn't exist.
             Exception: If file reading fails.
         """
-        if not file_path.exists():
-            self.__logger.error(f"Prompt file does not exist: {file_path}")
-            raise FileNotFoundError(f"Prompt file does not exist: {file_path}")
         try:
-            text = file_path.read_text(encoding="utf-8")
-            return text
+            return file_path.read_text(encoding="utf-8")
+        except FileNotFoundError as exception:
+            self.__logger.error(f"Prompt file does not exist: {file_path}")
+            raise FileNotFoundError(
+                f"Prompt file does not exist: {file_path}") from exception
         except Exception as exception:
             self.__logger.error(
                 f"Failed to load prompt from file {file_path}: {exception}",)
@@ -46,15 +46,14 @@ class FileAndAudioUtils:
         Returns:
             True if all devices are found, False otherwise.
         """
-        available_devices = sd.query_devices()
-        device_names_lower = [d["name"].lower() for d in available_devices]
+        available_names = device_cache.get_device_names()
         all_found = True
         for name in device_names:
             if not name:
                 self.__logger.error("Device name is None or empty.")
                 all_found = False
                 continue
-            if name.lower() not in device_names_lower:
+            if name.strip().lower() not in available_names:
                 self.__logger.error(f"Audio device not found: {name}")
                 all_found = False
         return all_found
@@ -0,0 +1,187 @@
+"""Adaptive concurrency limiting driven by API rate-limit feedback."""
+import asyncio
+import logging
+import re
+import time
+from types import TracebackType
+from typing import Final, Mapping, Optional, Type
+
+# Fraction of the request budget below which new requests are paused until
+# the window resets.
+LOW_REMAINING_RATIO: Final[float] = 0.1
+DURATION_PART_PATTERN: Final[re.Pattern] = re.compile(
+    r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+DURATION_UNIT_SECONDS: Final[Mapping[str, float]] = {
+    "ms": 0.001,
+    "s": 1.0,
+    "m": 60.0,
+    "h": 3600.0,
+}
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse a rate-limit reset duration such as ``"1s"`` or ``"6m0s"``.
+
+    Args:
+        value: Header value; plain numbers are taken as seconds.
+
+    Returns:
+        Duration in seconds, or None if the value cannot be parsed.
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_PART_PATTERN.findall(value)
+    if not parts:
+        return None
+    return sum(
+        float(amount) * DURATION_UNIT_SECONDS[unit] for amount, unit in parts)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on concurrent requests, used as ``async with limiter:``.
+
+    The number of requests allowed in flight grows additively after a run
+    of successful responses and shrinks multiplicatively when the API
+    reports that the rate limit was hit. Rate-limit headers of successful
+    responses pause new requests when the remaining budget runs low.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        increase_step: float = 0.5,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        """Initialize the limiter at its maximum concurrency.
+
+        Args:
+            max_concurrency: Upper bound of requests in flight.
+            min_concurrency: Lower bound the limit never shrinks below.
+            increase_step: Amount added to the limit after a full run of
+                successful responses.
+            decrease_factor: Factor applied to the limit on a rate-limit
+                response.
+        """
+        self.__logger = logging.getLogger(self.__class__.__name__)
+        self.__max_concurrency: Final[float] = float(max_concurrency)
+        self.__min_concurrency: Final[float] = float(
+            min(min_concurrency, max_concurrency))
+        self.__increase_step: Final[float] = increase_step
+        self.__decrease_factor: Final[float] = decrease_factor
+        self.__limit: float = self.__max_concurrency
+        self.__in_flight: int = 0
+        self.__successes: int = 0
+        self.__paused_until: float = 0.0
+        self.__condition: Optional[asyncio.Condition] = None
+
+    @property
+    def limit(self) -> int:
+        """Number of requests currently allowed in flight."""
+        return int(self.__limit)
+
+    async def __aenter__(self) -> "AdaptiveConcurrencyLimiter":
+        """Wait for a free slot and for any rate-limit pause to pass.
+
+        The pause is waited out before the slot is taken, so a caller
+        cancelled while paused never holds a slot it cannot release.
+
+        Returns:
+            The limiter itself.
+        """
+        condition = self.__get_condition()
+        while True:
+            delay = self.__paused_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            async with condition:
+                await condition.wait_for(
+                    lambda: self.__in_flight < int(self.__limit))
+                # A response received while waiting may have paused again.
+                if self.__paused_until <= time.monotonic():
+                    self.__in_flight += 1
+                    return self
+
+    async def __aexit__(
+        self,
+        _exc_type: Optional[Type[BaseException]],
+        _exc: Optional[BaseException],
+        _traceback: Optional[TracebackType],
+    ) -> None:
+        """Release the slot taken by ``__aenter__``."""
+        condition = self.__get_condition()
+        async with condition:
+            self.__in_flight -= 1
+            condition.notify_all()
+
+    def record_success(self, headers: Mapping[str, str]) -> None:
+        """Account for a successful response and its rate-limit headers.
+
+        Args:
+            headers: Response headers, e.g. ``x-ratelimit-remaining-requests``
+                and ``x-ratelimit-reset-requests``.
+        """
+        self.__successes += 1
+        if self.__successes >= int(self.__limit):
+            self.__successes = 0
+            # Waiters pick up the larger limit when this request's slot is
+            # released.
+            self.__limit = min(
+                self.__max_concurrency,
+                self.__limit + self.__increase_step,
+            )
+
+        try:
+            remaining = int(headers.get("x-ratelimit-remaining-requests", ""))
+            budget = int(headers.get("x-ratelimit-limit-requests", ""))
+        except ValueError:
+            return
+        if budget > 0 and remaining < budget * LOW_REMAINING_RATIO:
+            reset_after = _parse_duration(
+                headers.get("x-ratelimit-reset-requests"))
+            if reset_after:
+                self.__pause(reset_after)
+
+    def record_rate_limited(self, retry_after: Optional[str]) -> None:
+        """Shrink the limit after a rate-limit (HTTP 429) response.
+
+        Args:
+            retry_after: Value of the ``retry-after`` header, if present.
+        """
+        self.__successes = 0
+        self.__limit = max(
+            self.__min_concurrency,
+            self.__limit * self.__decrease_factor,
+        )
+        self.__logger.warning(
+            f"Rate limited; allowing {self.limit} concurrent requests.")
+        delay = _parse_duration(retry_after)
+        if delay:
+            self.__pause(delay)
+
+    def __pause(self, delay: float) -> None:
+        """Hold back new requests for ``delay`` seconds.
+
+        Args:
+            delay: Number of seconds to wait before the next request.
+        """
+        self.__paused_until = max(
+            self.__paused_until,
+            time.monotonic() + delay,
+        )
+
+    def __get_condition(self) -> asyncio.Condition:
+        """Return the condition guarding the slots, created on first use.
+
+        The condition is created lazily so it binds to the running loop.
+
+        Returns:
+            The limiter's condition variable.
+        """
+        if self.__condition is None:
+            self.__condition = asyncio.Condition()
+        return self.__condition